@@ -0,0 +1,29 @@
+"""Ahead-of-time compile the stock_analysis kernels into the ``stock_kernels`` extension."""
+
+from __future__ import annotations
+
+import os
+
+from numba.pycc import CC
+
+import stock_analysis
+
+KERNELS = (stock_analysis.weekly_minmax, stock_analysis.top_low_high)
+
+
+def _constant(value: int):
+    return lambda: value
+
+
+def main() -> None:
+    cc = CC("stock_kernels")
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    for kernel in KERNELS:
+        cc.export(kernel.__name__, kernel.signature)(kernel.__wrapped__)
+        stamp = stock_analysis._kernel_hash(kernel.__wrapped__, kernel.signature)
+        cc.export(f"{kernel.__name__}_hash", "int64()")(_constant(stamp))
+    cc.compile()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,33 +2,171 @@ from __future__ import annotations
 
 import argparse
 import csv
-from dataclasses import dataclass
+import functools
+import re
+import sys
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Iterable, List, Optional, Sequence, Tuple
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, NamedTuple, Optional, Sequence, Tuple
 
-@dataclass(frozen=True)
-class PriceBar:
-    timestamp: datetime
-    low: float
-    high: float
+import numpy as np
 
-    @property
-    def day_name(self) -> str:
-        return self.timestamp.strftime("%A")
+if TYPE_CHECKING:
+    import pandas as pd
 
-    @property
-    def time_of_day(self) -> str:
-        return self.timestamp.strftime("%H:%M")
+_WEEK_NS = 7 * 86_400 * 10**9
+_MONDAY_EPOCH = np.datetime64("1970-01-05", "ns")
 
 
-def fetch_hourly_bars(
-    symbol: str,
-    *,
-    days: int = 60,
-    auto_adjust: bool = True,
-) -> List[PriceBar]:
-    """Download hourly OHLC data for the last ``days`` using yfinance."""
+_DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_DAY_NS = 86_400 * 10**9
+_MINUTE_NS = 60 * 10**9
+
+_CSV_COLUMNS = ("timestamp", "low", "high")
+_CSV_BLOCK_SIZE = 4 << 20
+# A trailing UTC offset after the time of day, e.g. "Z", "-05:00" or "+0530".
+_UTC_OFFSET = r"^(.*[T ]\d[\d:.,]*?)(?:Z|[+-]\d{2}(?::?\d{2})?)$"
+
+_CACHE_DIR = Path.home() / ".cache" / "stock_analysis"
+_CACHE_MAX_AGE = timedelta(hours=1)
 
+
+def _kernel_hash(func, signature) -> int:
+    """Stamp of a kernel's source and signature, exported by build_kernels.py to spot stale AOT builds."""
+
+    import hashlib
+    import inspect
+
+    digest = hashlib.sha256(f"{signature}\n{inspect.getsource(func)}".encode()).digest()
+    return int.from_bytes(digest[:8], "little", signed=True)
+
+
+def _load_kernel(func, signature, options):
+    # Prefer an up-to-date build from build_kernels.py, then numba, then plain Python.
+    try:
+        import stock_kernels
+    except ImportError:
+        pass
+    else:
+        compiled = getattr(stock_kernels, func.__name__, None)
+        stamp = getattr(stock_kernels, f"{func.__name__}_hash", None)
+        if compiled is not None and stamp is not None and stamp() == _kernel_hash(func, signature[0]):
+            return compiled
+
+    try:
+        from numba import njit
+    except ModuleNotFoundError:  # pragma: no cover - numba is an optional accelerator
+        return func
+    return njit(*signature, **options)(func)
+
+
+def _jit(*signature, **options):
+    """Compile the decorated kernel with ``numba.njit(*signature, **options)`` on first call."""
+
+    def decorate(func):
+        compiled = None
+
+        @functools.wraps(func)
+        def kernel(*args):
+            nonlocal compiled
+            if compiled is None:
+                compiled = _load_kernel(func, signature, options)
+            return compiled(*args)
+
+        kernel.signature = signature[0] if signature else None
+        return kernel
+
+    return decorate
+
+
+class Bars(NamedTuple):
+    """Hourly bars as parallel, timestamp-sorted arrays (wall-clock ``datetime64[ns]``, ``float64``)."""
+
+    ts: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+    weekday: np.ndarray
+    minute: np.ndarray
+
+    @classmethod
+    def from_arrays(cls, ts: np.ndarray, low: np.ndarray, high: np.ndarray) -> Bars:
+        # Callers may hand in other units (pandas defaults to datetime64[us]); the integer maths needs ns.
+        ts = np.asarray(ts, dtype="datetime64[ns]")
+        ns = ts.view(np.int64)
+        # The epoch, 1970-01-01, was a Thursday.
+        weekday = ((ns // _DAY_NS + 3) % 7).astype(np.int8)
+        minute = (ns // _MINUTE_NS % 1440).astype(np.int16)
+        # The typed kernels need writable contiguous float64; float32 would merge nearby high prices.
+        low = np.require(low, np.float64, ["C", "W"])
+        high = np.require(high, np.float64, ["C", "W"])
+        return cls(ts, low, high, weekday, minute)
+
+    def day_name(self, i: int) -> str:
+        return _DAY_NAMES[self.weekday[i]]
+
+    def time_of_day(self, i: int) -> str:
+        return format_minutes(int(self.minute[i]))
+
+    def take(self, idx) -> Bars:
+        return Bars(*(column[idx] for column in self))
+
+
+def _sorted_bars(ts: np.ndarray, low: np.ndarray, high: np.ndarray) -> Bars:
+    # Downloads and most CSVs are already chronological; only reorder when they are not.
+    if not np.all(ts[1:] >= ts[:-1]):
+        order = np.argsort(ts, kind="stable")
+        ts, low, high = ts[order], low[order], high[order]
+    return Bars.from_arrays(ts, low, high)
+
+
+def _wall_clock(index) -> np.ndarray:
+    """Drop any timezone from a ``DatetimeIndex`` while keeping its local wall-clock time."""
+
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype("datetime64[ns]")
+
+
+def _from_yf_df(df: pd.DataFrame) -> Bars:
+    ts = _wall_clock(df.index)
+    if ts.size == 0:
+        raise ValueError("No hourly bars parsed from yfinance response.")
+    return _sorted_bars(ts, df["Low"].to_numpy(dtype=np.float64), df["High"].to_numpy(dtype=np.float64))
+
+
+def _cache_path(symbol: str, days: int, auto_adjust: bool) -> Path:
+    # Keep the symbol to ticker characters so it can never name a path outside the cache directory.
+    safe_symbol = re.sub(r"[^A-Z0-9.^=-]", "_", symbol.upper())
+    adjustment = "adj" if auto_adjust else "raw"
+    return _CACHE_DIR / f"{safe_symbol}_{days}d_1h_{adjustment}.parquet"
+
+
+def _read_cache(path: Path) -> Optional[pd.DataFrame]:
+    try:
+        age = time.time() - path.stat().st_mtime
+    except OSError:
+        return None
+    if age > _CACHE_MAX_AGE.total_seconds():
+        return None
+
+    import pandas as pd
+
+    try:
+        return pd.read_parquet(path, engine="pyarrow")
+    except (ImportError, OSError, ValueError):  # pyarrow missing or unreadable cache file
+        return None
+
+
+def _write_cache(path: Path, df: pd.DataFrame) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df[["Low", "High"]].to_parquet(path, engine="pyarrow", compression="zstd")
+    except (ImportError, OSError, ValueError):  # caching is best-effort
+        pass
+
+
+def _download_hourly(symbol: str, days: int, auto_adjust: bool) -> pd.DataFrame:
     try:
         import yfinance as yf
     except ModuleNotFoundError as exc:  # pragma: no cover - import guard
@@ -55,83 +193,259 @@ def fetch_hourly_bars(
     missing = {"High", "Low"} - set(df.columns)
     if missing:
         raise ValueError(f"Missing expected columns from yfinance response: {', '.join(sorted(missing))}")
+    return df
 
-    points: List[PriceBar] = []
-    for ts, row in df.iterrows():
-        ts_dt = ts.to_pydatetime()
-        points.append(PriceBar(timestamp=ts_dt, low=float(row["Low"]), high=float(row["High"])))
 
-    if not points:
-        raise ValueError("No hourly bars parsed from yfinance response.")
+def fetch_hourly_bars(
+    symbol: str,
+    *,
+    days: int = 60,
+    auto_adjust: bool = True,
+    use_cache: bool = True,
+) -> Bars:
+    """Download hourly OHLC data for the last ``days`` using yfinance, cached for up to an hour."""
+
+    cache = _cache_path(symbol, days, auto_adjust) if use_cache else None
+    df = _read_cache(cache) if cache else None
+    if df is None:
+        df = _download_hourly(symbol, days, auto_adjust)
+        if cache:
+            _write_cache(cache, df)
+
+    return _from_yf_df(df)
+
+
+def _arrow_values(column, dtype) -> np.ndarray:
+    """NumPy view of a primitive Arrow array (``Array.to_numpy()`` would import pandas)."""
+
+    if column.null_count:
+        return column.to_numpy(zero_copy_only=False).astype(dtype)
+    return np.frombuffer(column.buffers()[1], dtype=dtype, count=column.offset + len(column))[column.offset:]
+
+
+def _arrow_timestamps(column) -> np.ndarray:
+    """Convert an Arrow timestamp column to ``datetime64[ns]``."""
+
+    import pyarrow as pa
+
+    if not pa.types.is_timestamp(column.type):
+        # Layouts pyarrow does not recognise (e.g. compact "20240318T094500") come through as strings.
+        raise pa.ArrowInvalid("CSV timestamps are not in a form pyarrow parses")
+    if column.type.tz is not None:
+        # pyarrow shifts values carrying a UTC offset to UTC and drops the offset, losing their wall-clock time.
+        raise pa.ArrowInvalid("CSV timestamps carry a UTC offset")
+    return _arrow_values(column, f"datetime64[{column.type.unit}]").astype("datetime64[ns]")
+
+
+def _stream_csv(path: str) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Yield ``(ts, low, high)`` arrays block by block using pyarrow's streaming CSV reader."""
+
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=_CSV_BLOCK_SIZE),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=list(_CSV_COLUMNS),
+            column_types={"low": pa.float64(), "high": pa.float64()},
+        ),
+    )
+    for batch in reader:
+        low = _arrow_values(batch.column("low"), np.float64)
+        high = _arrow_values(batch.column("high"), np.float64)
+        yield _arrow_timestamps(batch.column("timestamp")), low, high
 
-    return sorted(points, key=lambda p: p.timestamp)
 
+def _read_csv_pandas(path: str) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    import pandas as pd
 
-def parse_price_points(path: str) -> List[PriceBar]:
-    """Fallback loader for pre-downloaded CSV data."""
+    df = pd.read_csv(path, usecols=list(_CSV_COLUMNS), dtype={"timestamp": str, "low": "float64", "high": "float64"})
+    # Like _wall_clock for yfinance data, keep each timestamp's own wall-clock time by dropping its offset.
+    text = df["timestamp"].str.replace(_UTC_OFFSET, r"\1", regex=True)
+    stamps = pd.to_datetime(text, format="ISO8601", cache=True)
+    yield stamps.to_numpy(dtype="datetime64[ns]"), df["low"].to_numpy(), df["high"].to_numpy()
+
+
+def parse_price_points(
+    path: str,
+    *,
+    start: Optional[np.datetime64] = None,
+    end: Optional[np.datetime64] = None,
+    last_weeks: Optional[int] = None,
+) -> Bars:
+    """Fallback loader for pre-downloaded CSV data, keeping only bars in ``[start, end)`` or the ``last_weeks``."""
 
-    points: List[PriceBar] = []
     with open(path, newline="") as f:
-        reader = csv.DictReader(f)
-        expected = {"timestamp", "low", "high"}
-        missing = expected - set(reader.fieldnames or [])
-        if missing:
-            raise ValueError(f"Missing required columns: {', '.join(sorted(missing))}")
-        for row in reader:
-            ts = datetime.fromisoformat(row["timestamp"])
-            points.append(PriceBar(timestamp=ts, low=float(row["low"]), high=float(row["high"])))
-    if not points:
+        header = next(csv.reader(f), [])
+    missing = set(_CSV_COLUMNS) - set(header)
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(sorted(missing))}")
+
+    collect = functools.partial(_collect_window, start=start, end=end, last_weeks=last_weeks)
+    try:
+        import pyarrow as pa
+    except ModuleNotFoundError:
+        return collect(_read_csv_pandas(path))
+    try:
+        return collect(_stream_csv(path))
+    except pa.ArrowInvalid:
+        # Timestamp forms pyarrow cannot stream (mixed across blocks, offsets, compact ISO-8601).
+        return collect(_read_csv_pandas(path))
+
+
+def _between(block, start, end):
+    ts, low, high = block
+    keep = np.ones(ts.size, dtype=bool)
+    if start is not None:
+        keep &= ts >= start
+    if end is not None:
+        keep &= ts < end
+    return ts[keep], low[keep], high[keep]
+
+
+def _collect_window(
+    blocks: Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+    start: Optional[np.datetime64],
+    end: Optional[np.datetime64],
+    last_weeks: Optional[int],
+) -> Bars:
+    kept = []
+    rows = 0
+    latest = None
+    for block in blocks:
+        ts = block[0]
+        missing = np.isnat(ts)
+        if missing.any():
+            raise ValueError(f"Missing or invalid timestamp in data row {rows + int(missing.argmax()) + 1}.")
+        rows += ts.size
+        if last_weeks is not None and ts.size and (latest is None or ts.max() > latest):
+            # The window ends at the latest bar so far; the file may be unsorted, so re-prune kept blocks.
+            latest = ts.max()
+            start = week_start(_week_id(latest) - last_weeks + 1)
+            kept = [_between(earlier, start, end) for earlier in kept]
+        if start is not None or end is not None:
+            block = _between(block, start, end)
+        kept.append(block)
+
+    if not rows:
         raise ValueError("No price points loaded for the selected filters.")
-    return sorted(points, key=lambda p: p.timestamp)
+    ts, low, high = (np.concatenate(columns) for columns in zip(*kept))
+    return _sorted_bars(ts, low, high)
 
 
-def beginning_of_week(dt: datetime) -> datetime:
-    return dt - timedelta(
-        days=dt.weekday(),
-        hours=dt.hour,
-        minutes=dt.minute,
-        seconds=dt.second,
-        microseconds=dt.microsecond,
-    )
+def _week_id(ts) -> np.ndarray:
+    """Number of whole weeks between the Monday 1970-01-05 and ``ts``."""
+
+    return (np.asarray(ts, dtype="datetime64[ns]") - _MONDAY_EPOCH).astype(np.int64) // _WEEK_NS
+
+
+def _parse_week(text: str) -> int:
+    return int(_week_id(datetime.fromisoformat(text).replace(tzinfo=None)))
+
 
+def week_start(week) -> np.ndarray:
+    """Monday 00:00 of the given week id(s), as ``datetime64[ns]``."""
 
-def select_week(points: Sequence[PriceBar], week_start: datetime) -> List[PriceBar]:
-    week_end = week_start + timedelta(days=7)
-    return [p for p in points if week_start <= p.timestamp < week_end]
+    return _MONDAY_EPOCH + np.asarray(week, dtype=np.int64) * np.timedelta64(_WEEK_NS, "ns")
 
 
-def extremes(points: Sequence[PriceBar], count: int, *, high: bool) -> List[PriceBar]:
-    key = (lambda p: (-p.high, p.timestamp)) if high else (lambda p: (p.low, p.timestamp))
-    return sorted(points, key=key)[:count]
+def select_week(bars: Bars, week: int) -> slice:
+    """Slice of ``bars`` falling in the given week; indexing with it yields views."""
 
+    lo, hi = np.searchsorted(bars.ts, week_start([week, week + 1]))
+    return slice(int(lo), int(hi))
 
-def weekly_extremes(points: Sequence[PriceBar], week_start: datetime) -> Tuple[List[PriceBar], List[PriceBar]]:
-    week_points = select_week(points, week_start)
-    if not week_points:
+
+@_jit(
+    "Tuple((int64[::1], int64[::1]))(float64[::1], float64[::1], int64)",
+    cache=True,
+    nogil=True,
+    boundscheck=False,
+)
+def top_low_high(low, high, count):
+    """Positions of the ``count`` lowest lows and highest highs (earliest bar on ties, -1 if unfilled)."""
+
+    low_idx = np.full(count, -1, dtype=np.int64)
+    high_idx = np.full(count, -1, dtype=np.int64)
+    n_low = 0
+    n_high = 0
+    for i in range(low.size):
+        x = low[i]
+        if x == x and (n_low < count or x < low[low_idx[count - 1]]):
+            j = min(n_low, count - 1)
+            while j > 0 and x < low[low_idx[j - 1]]:
+                low_idx[j] = low_idx[j - 1]
+                j -= 1
+            low_idx[j] = i
+            n_low = min(n_low + 1, count)
+        y = high[i]
+        if y == y and (n_high < count or y > high[high_idx[count - 1]]):
+            j = min(n_high, count - 1)
+            while j > 0 and y > high[high_idx[j - 1]]:
+                high_idx[j] = high_idx[j - 1]
+                j -= 1
+            high_idx[j] = i
+            n_high = min(n_high + 1, count)
+    return low_idx, high_idx
+
+
+def weekly_extremes(bars: Bars, week: int) -> Tuple[Bars, Bars]:
+    in_week = select_week(bars, week)
+    if in_week.start == in_week.stop:
         raise ValueError("No price points found for the requested week.")
-    return extremes(week_points, 3, high=False), extremes(week_points, 3, high=True)
+    week_bars = bars.take(in_week)
+    low_idx, high_idx = top_low_high(week_bars.low, week_bars.high, 3)
+    return week_bars.take(low_idx[low_idx >= 0]), week_bars.take(high_idx[high_idx >= 0])
+
+
+# fastmath leaves out "nnan"/"ninf" so NaN prices still compare false.
+@_jit(
+    "Tuple((int64[::1], int64[::1]))(int64[::1], float64[::1], float64[::1], int64)",
+    cache=True,
+    nogil=True,
+    boundscheck=False,
+    fastmath={"nsz", "arcp", "contract", "afn", "reassoc"},
+)
+def weekly_minmax(weeks, low, high, n_weeks):
+    """Per-week positions of the lowest low and highest high of bars with ``weeks`` in ``[0, n_weeks)``."""
+
+    low_idx = np.full(n_weeks, -1, dtype=np.int64)
+    high_idx = np.full(n_weeks, -1, dtype=np.int64)
+    low_val = np.full(n_weeks, np.inf)
+    high_val = np.full(n_weeks, -np.inf)
+    for i in range(weeks.size):
+        w = weeks[i]
+        if w < 0 or w >= n_weeks:
+            continue
+        # Branchless selects: fmin/fmax also skip NaN.
+        x = low[i]
+        lower = x < low_val[w]
+        low_val[w] = np.fmin(x, low_val[w])
+        low_idx[w] = i if lower else low_idx[w]
+        # >= so ties on the high resolve to the latest bar, matching max() over (high, timestamp).
+        y = high[i]
+        higher = y >= high_val[w]
+        high_val[w] = np.fmax(y, high_val[w])
+        high_idx[w] = i if higher else high_idx[w]
+    return low_idx, high_idx
+
 
+def weekly_high_low(bars: Bars, first_week: int, n_weeks: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions of the lowest low and highest high for ``n_weeks`` weeks from ``first_week`` (-1 if empty)."""
 
-def weekly_high_low(points: Sequence[PriceBar], week_start: datetime) -> Tuple[PriceBar, PriceBar]:
-    week_points = select_week(points, week_start)
-    if not week_points:
-        raise ValueError("No data for week starting %s" % week_start.date())
-    low = min(week_points, key=lambda p: (p.low, p.timestamp))
-    high = max(week_points, key=lambda p: (p.high, p.timestamp))
-    return low, high
+    weeks = _week_id(bars.ts) - first_week
+    return weekly_minmax(weeks, bars.low, bars.high, n_weeks)
 
 
-def average_minutes(times: Iterable[datetime]) -> Optional[int]:
-    times = list(times)
-    if not times:
+def average_minutes(times: np.ndarray) -> Optional[int]:
+    """Mean minute-of-day of a ``datetime64`` array, or ``None`` when it is empty."""
+
+    if times.size == 0:
         return None
 
-    tzinfo = times[0].tzinfo
-    mins = []
-    for ts in times:
-        aligned = ts.astimezone(tzinfo) if tzinfo and ts.tzinfo else ts
-        mins.append(aligned.hour * 60 + aligned.minute)
-    return round(sum(mins) / len(mins))
+    ns = np.asarray(times, dtype="datetime64[ns]").view(np.int64)
+    return int(round((ns // _MINUTE_NS % 1440).mean()))
 
 
 def format_minutes(mins: Optional[int]) -> str:
@@ -141,49 +455,48 @@ def format_minutes(mins: Optional[int]) -> str:
     return f"{hours:02d}:{minutes:02d}"
 
 
-def describe_week(week_start: datetime) -> str:
-    week_end = week_start + timedelta(days=6)
-    return f"{week_start.date()} to {week_end.date()}"
+def describe_week(week: int) -> str:
+    first_day = week_start(week).astype("datetime64[D]")
+    return f"{first_day} to {first_day + 6}"
+
 
+def analyze(bars: Bars, target_week: Optional[str], window_weeks: int = 12) -> None:
+    """Print the target week's extremes and the window summary for already-loaded ``bars``."""
 
-def analyze(points: Sequence[PriceBar], target_week: Optional[str], window_weeks: int = 12) -> None:
-    latest_week_start = beginning_of_week(points[-1].timestamp)
     if target_week:
-        parsed = datetime.fromisoformat(target_week)
-        week_start = beginning_of_week(parsed)
+        week = _parse_week(target_week)
     else:
-        week_start = latest_week_start
+        week = int(_week_id(bars.ts[-1]))
 
-    lows, highs = weekly_extremes(points, week_start)
+    lows, highs = weekly_extremes(bars, week)
 
-    print(f"Weekly highs/lows for {describe_week(week_start)}\n")
+    print(f"Weekly highs/lows for {describe_week(week)}\n")
     print("Top 3 lows:")
-    for p in lows:
-        print(f"  ${p.low:.2f} on {p.day_name} at {p.time_of_day}")
+    for i in range(lows.ts.size):
+        print(f"  ${lows.low[i]:.2f} on {lows.day_name(i)} at {lows.time_of_day(i)}")
 
     print("\nTop 3 highs:")
-    for p in highs:
-        print(f"  ${p.high:.2f} on {p.day_name} at {p.time_of_day}")
-
-    print(f"\n{window_weeks}-week window (including target week):")
-    week_starts = [week_start - timedelta(weeks=i) for i in reversed(range(window_weeks))]
-    low_times = []
-    high_times = []
-    for ws in week_starts:
-        try:
-            low, high = weekly_high_low(points, ws)
-        except ValueError:
-            print(f"  Week {describe_week(ws)}: no data available")
+    for i in range(highs.ts.size):
+        print(f"  ${highs.high[i]:.2f} on {highs.day_name(i)} at {highs.time_of_day(i)}")
+
+    weeks = week - np.arange(window_weeks - 1, -1, -1)
+    low_idx, high_idx = weekly_high_low(bars, week - window_weeks + 1, weeks.size)
+    found = (low_idx >= 0) & (high_idx >= 0)
+    low_prices = np.where(found, np.char.mod("%.2f", bars.low[low_idx]), "")
+    high_prices = np.where(found, np.char.mod("%.2f", bars.high[high_idx]), "")
+    lines = [f"\n{window_weeks}-week window (including target week):"]
+    for i, w in enumerate(weeks):
+        if not found[i]:
+            lines.append(f"  Week {describe_week(w)}: no data available")
             continue
-        low_times.append(low.timestamp)
-        high_times.append(high.timestamp)
-        print(
-            f"  Week {describe_week(ws)}: low ${low.low:.2f} at {low.time_of_day}, "
-            f"high ${high.high:.2f} at {high.time_of_day}"
+        lines.append(
+            f"  Week {describe_week(w)}: low ${low_prices[i]} at {bars.time_of_day(low_idx[i])}, "
+            f"high ${high_prices[i]} at {bars.time_of_day(high_idx[i])}"
         )
+    sys.stdout.write("\n".join(lines) + "\n")
 
-    avg_low = format_minutes(average_minutes(low_times))
-    avg_high = format_minutes(average_minutes(high_times))
+    avg_low = format_minutes(average_minutes(bars.ts[low_idx[found]]))
+    avg_high = format_minutes(average_minutes(bars.ts[high_idx[found]]))
     print("\nAverage time of weekly lows:", avg_low)
     print("Average time of weekly highs:", avg_high)
 
@@ -214,6 +527,11 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Disable auto-adjustment for splits/dividends when fetching data.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always download fresh data instead of reusing a cached response from the last hour.",
+    )
     parser.add_argument(
         "--data",
         help="Optional CSV fallback with columns timestamp,low,high; skips yfinance download when provided.",
@@ -221,17 +539,28 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def load_points(args: argparse.Namespace) -> List[PriceBar]:
+def load_points(args: argparse.Namespace) -> Bars:
     if args.data:
-        return parse_price_points(args.data)
-    return fetch_hourly_bars(args.symbol, days=args.days, auto_adjust=not args.no_auto_adjust)
+        # Only the target (or latest) week and the weeks of the window before it are ever reported.
+        weeks = max(args.window, 1)
+        if not args.week:
+            return parse_price_points(args.data, last_weeks=weeks)
+        week = _parse_week(args.week)
+        start, end = week_start([week - weeks + 1, week + 1])
+        return parse_price_points(args.data, start=start, end=end)
+    return fetch_hourly_bars(
+        args.symbol,
+        days=args.days,
+        auto_adjust=not args.no_auto_adjust,
+        use_cache=not args.no_cache,
+    )
 
 
 def main(argv: Optional[Sequence[str]] = None) -> None:
     parser = build_parser()
     args = parser.parse_args(argv)
-    points = load_points(args)
-    analyze(points, args.week, window_weeks=args.window)
+    bars = load_points(args)
+    analyze(bars, args.week, window_weeks=args.window)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,196 @@
+import os
+import sys
+import time
+import types
+
+import numpy as np
+import pytest
+
+import stock_analysis
+
+
+def _write_csv(path, rows):
+    path.write_text("timestamp,low,high\n" + "".join(f"{ts},{low},{high}\n" for ts, low, high in rows))
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "late_ts, expected",
+    [
+        ("2035-07-15T00:00:00.5", "2035-07-15T00:00:00.5"),
+        ("2035-07-15T00:00:00Z", "2035-07-15T00:00:00"),
+        ("20350715T000000", "2035-07-15T00:00:00"),
+    ],
+)
+def test_csv_timestamp_form_changing_after_first_block(tmp_path, monkeypatch, late_ts, expected):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(stock_analysis, "_CSV_BLOCK_SIZE", 1 << 10)
+    rows = [(f"2035-07-{day:02d}T{hour:02d}:00:00", 10.0, 11.0) for day in range(1, 15) for hour in range(9, 16)]
+    path = _write_csv(tmp_path / "prices.csv", rows + [(late_ts, 1.0, 2.0)])
+
+    bars = stock_analysis.parse_price_points(path)
+
+    assert bars.ts.size == len(rows) + 1
+    assert bars.ts[-1] == np.datetime64(expected, "ns")
+
+
+def test_compact_iso_timestamps(tmp_path, csv_engine):
+    path = _write_csv(tmp_path / "prices.csv", [("20240318T094500", 1.0, 2.0), ("20240318T104500", 1.0, 2.0)])
+
+    bars = stock_analysis.parse_price_points(path)
+
+    assert bars.ts.tolist() == np.array(["2024-03-18T09:45", "2024-03-18T10:45"], "datetime64[ns]").tolist()
+
+
+@pytest.fixture(params=["pyarrow", "pandas"])
+def csv_engine(request, monkeypatch):
+    if request.param == "pyarrow":
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(stock_analysis, "_stream_csv", stock_analysis._read_csv_pandas)
+    return request.param
+
+
+def test_csv_offsets_keep_wall_clock_time(tmp_path, csv_engine):
+    rows = [("2024-03-08 09:30:00-05:00", 1.0, 2.0), ("2024-03-11 15:30:00-04:00", 1.0, 2.0)]
+    path = _write_csv(tmp_path / "prices.csv", rows)
+
+    bars = stock_analysis.parse_price_points(path)
+
+    assert bars.ts.tolist() == np.array(["2024-03-08T09:30", "2024-03-11T15:30"], "datetime64[ns]").tolist()
+
+
+def test_blank_timestamp_is_rejected(tmp_path, csv_engine):
+    rows = [("2024-03-08T09:30:00", 1.0, 2.0), ("", 1.0, 2.0)]
+    path = _write_csv(tmp_path / "prices.csv", rows)
+
+    with pytest.raises(ValueError, match="timestamp in data row 2"):
+        stock_analysis.parse_price_points(path)
+
+
+def test_default_run_keeps_only_the_latest_weeks(tmp_path, monkeypatch, csv_engine):
+    monkeypatch.setattr(stock_analysis, "_CSV_BLOCK_SIZE", 1 << 10)
+    days = np.arange(np.datetime64("2024-01-01"), np.datetime64("2024-03-01"))
+    rows = [(f"{day}T{hour:02d}:00:00", 1.0, 2.0) for day in days[::-1] for hour in range(9, 16)]
+    path = _write_csv(tmp_path / "prices.csv", rows)
+
+    bars = stock_analysis.parse_price_points(path, last_weeks=2)
+
+    # 2024-02-29 is a Thursday, so the window starts on Monday 2024-02-19.
+    assert bars.ts[0] == np.datetime64("2024-02-19T09:00", "ns")
+    assert bars.ts[-1] == np.datetime64("2024-02-29T15:00", "ns")
+    assert bars.ts.size == 11 * 7
+
+
+def test_week_without_rows_keeps_week_specific_error(tmp_path):
+    path = _write_csv(tmp_path / "prices.csv", [("2024-01-01T09:45:00", 1.0, 2.0)])
+
+    with pytest.raises(ValueError, match="No price points found for the requested week."):
+        stock_analysis.main(["X", "--data", path, "--week", "2030-01-07"])
+
+
+def _implementations(kernel):
+    # The _jit wrapper (numba or the AOT build when available) and the plain-Python body it falls back to.
+    return pytest.mark.parametrize("impl", [kernel, kernel.__wrapped__], ids=["compiled", "python"])
+
+
+@_implementations(stock_analysis.top_low_high)
+def test_top_low_high_ties_keep_earliest_bar(impl):
+    low = np.array([3.0, 1.0, 2.0, 1.0, 2.0])
+    high = np.array([5.0, 7.0, 7.0, 6.0, 7.0])
+
+    low_idx, high_idx = impl(low, high, 3)
+
+    assert low_idx.tolist() == [1, 3, 2]
+    assert high_idx.tolist() == [1, 2, 4]
+
+
+@_implementations(stock_analysis.top_low_high)
+def test_top_low_high_skips_nan_and_pads_short_weeks(impl):
+    low = np.array([np.nan, 2.0, 1.0])
+    high = np.array([4.0, np.nan, 3.0])
+
+    low_idx, high_idx = impl(low, high, 3)
+
+    assert low_idx.tolist() == [2, 1, -1]
+    assert high_idx.tolist() == [0, 2, -1]
+
+
+@_implementations(stock_analysis.weekly_minmax)
+def test_weekly_minmax_ties_take_earliest_low_and_latest_high(impl):
+    weeks = np.array([0, 0, 0, 0], dtype=np.int64)
+    low = np.array([2.0, 1.0, 1.0, 3.0])
+    high = np.array([5.0, 4.0, 5.0, 3.0])
+
+    low_idx, high_idx = impl(weeks, low, high, 1)
+
+    assert low_idx.tolist() == [1]
+    assert high_idx.tolist() == [2]
+
+
+@_implementations(stock_analysis.weekly_minmax)
+def test_weekly_minmax_skips_nan_empty_and_out_of_range_weeks(impl):
+    weeks = np.array([-1, 0, 0, 2, 3], dtype=np.int64)
+    low = np.array([0.5, np.nan, 2.0, 1.0, 0.1])
+    high = np.array([9.0, 8.0, np.nan, 1.5, 9.0])
+
+    low_idx, high_idx = impl(weeks, low, high, 3)
+
+    assert low_idx.tolist() == [2, -1, 3]
+    assert high_idx.tolist() == [1, -1, 3]
+
+
+@pytest.fixture
+def fake_yfinance(tmp_path, monkeypatch):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(stock_analysis, "_CACHE_DIR", tmp_path / "cache")
+    downloads = []
+
+    def download(symbol, **kwargs):
+        downloads.append(symbol)
+        index = pd.date_range("2024-03-18 09:30", periods=7, freq="h", tz="America/New_York")
+        return pd.DataFrame({"Low": np.arange(7.0), "High": np.arange(7.0) + 1}, index=index)
+
+    monkeypatch.setitem(sys.modules, "yfinance", types.SimpleNamespace(download=download))
+    return downloads
+
+
+def test_fresh_cache_skips_download(fake_yfinance):
+    first = stock_analysis.fetch_hourly_bars("AAPL")
+    second = stock_analysis.fetch_hourly_bars("AAPL")
+
+    assert fake_yfinance == ["AAPL"]
+    assert second.ts.tolist() == first.ts.tolist()
+    assert second.low.tolist() == first.low.tolist()
+
+
+def test_stale_cache_downloads_again(fake_yfinance):
+    stock_analysis.fetch_hourly_bars("AAPL")
+    cache = stock_analysis._cache_path("AAPL", 60, True)
+    stale = time.time() - stock_analysis._CACHE_MAX_AGE.total_seconds() - 60
+    os.utime(cache, (stale, stale))
+
+    stock_analysis.fetch_hourly_bars("AAPL")
+
+    assert fake_yfinance == ["AAPL", "AAPL"]
+
+
+def test_no_cache_bypasses_cache(fake_yfinance):
+    args = stock_analysis.build_parser().parse_args(["AAPL", "--no-cache"])
+
+    stock_analysis.load_points(args)
+    stock_analysis.load_points(args)
+
+    assert fake_yfinance == ["AAPL", "AAPL"]
+    assert not stock_analysis._CACHE_DIR.exists()
+
+
+@pytest.mark.parametrize("symbol", ["../../etc/passwd", "a/b", ".."])
+def test_cache_path_stays_in_cache_dir(tmp_path, monkeypatch, symbol):
+    monkeypatch.setattr(stock_analysis, "_CACHE_DIR", tmp_path)
+
+    path = stock_analysis._cache_path(symbol, 60, True)
+
+    assert path.parent == tmp_path
+    assert path.resolve().parent == tmp_path.resolve()